@@ -33,6 +33,12 @@ def _create_description(description):
     return description
 
 
+def _is_flat_int_indices(indices):
+    # samplers may also yield sequences of indices per item, e.g.
+    # SequenceSampler, which __getitems__ cannot gather in one go
+    return all(isinstance(i, (int, np.integer)) for i in indices)
+
+
 class BaseDataset(Dataset):
     """Returns samples from an mne.io.Raw object along with a target.
 
@@ -194,7 +200,43 @@ class WindowsDataset(BaseDataset):
         np.ndarray
             Crop indices.
         """
-        X = self.windows.get_data(item=index)[0].astype('float32')
+        X = self._get_windows_data(index)[0]
+        return self._get_window_item(X, index)
+
+    def __getitems__(self, indices):
+        """Get several windows and their targets at once.
+
+        All requested windows are read from the mne.Epochs in one call
+        instead of one call per window. Used by
+        :class:`torch.utils.data.DataLoader` to fetch a whole batch.
+
+        Parameters
+        ----------
+        indices : list of int
+            Indices to the windows (and targets) to return.
+
+        Returns
+        -------
+        list of tuple
+            One ``(X, y, crop_inds)`` tuple per index, as returned by
+            ``__getitem__``.
+        """
+        if (type(self).__getitem__ is not WindowsDataset.__getitem__ or
+                not _is_flat_int_indices(indices)):
+            # respect subclasses that override __getitem__
+            return [self[i] for i in indices]
+        Xs = self._get_windows_data(indices)
+        if len(Xs) != len(indices):
+            # lazy windows rejected while reading, e.g. with reject or flat
+            # set, would pair the remaining windows with the wrong targets
+            return [self[i] for i in indices]
+        return [self._get_window_item(X, index)
+                for X, index in zip(Xs, indices)]
+
+    def _get_windows_data(self, item):
+        return self.windows.get_data(item=item).astype('float32')
+
+    def _get_window_item(self, X, index):
         if self.transform is not None:
             X = self.transform(X)
         if self.targets_from == 'metadata':
@@ -270,10 +312,36 @@ class BaseConcatDataset(ConcatDataset):
 
         self.target_transform = target_transform
 
+    def _get_items(self, indices):
+        # fetch items of the same dataset together through its __getitems__
+        indices = np.asarray(indices)
+        if indices.size and indices.dtype.kind not in 'iu':
+            raise IndexError('only integers are valid indices, got dtype '
+                             f'{indices.dtype}')
+        indices = indices.astype(int)
+        if np.any(indices < -len(self)):
+            raise ValueError("absolute value of index should not exceed "
+                             "dataset length")
+        indices = np.where(indices < 0, indices + len(self), indices)
+        i_datasets = np.searchsorted(
+            self.cumulative_sizes, indices, side='right')
+        items = [None] * len(indices)
+        for i_ds in np.unique(i_datasets):
+            i_items = np.flatnonzero(i_datasets == i_ds)
+            offset = self.cumulative_sizes[i_ds - 1] if i_ds > 0 else 0
+            ds_indices = (indices[i_items] - offset).tolist()
+            ds = self.datasets[i_ds]
+            if hasattr(ds, '__getitems__'):
+                ds_items = ds.__getitems__(ds_indices)
+            else:
+                ds_items = [ds[ind] for ind in ds_indices]
+            for i_item, item in zip(i_items, ds_items):
+                items[i_item] = item
+        return items
+
     def _get_sequence(self, indices):
         X, y = list(), list()
-        for ind in indices:
-            out_i = super().__getitem__(ind)
+        for out_i in self._get_items(indices):
             X.append(out_i[0])
             y.append(out_i[1])
 
@@ -300,6 +368,36 @@ class BaseConcatDataset(ConcatDataset):
             item = item[:1] + (self.target_transform(item[1]),) + item[2:]
         return item
 
+    def __getitems__(self, indices):
+        """Get several items at once.
+
+        Indices belonging to the same dataset are fetched together through
+        that dataset's ``__getitems__`` (if it has one), e.g. to read all
+        windows of a batch from a WindowsDataset in one go. Used by
+        :class:`torch.utils.data.DataLoader` to fetch a whole batch.
+
+        Parameters
+        ----------
+        indices : list of int
+            Indices of the items to return.
+
+        Returns
+        -------
+        list of tuple
+            One item per index, as returned by ``__getitem__``.
+        """
+        if (type(self).__getitem__ is not BaseConcatDataset.__getitem__ or
+                not _is_flat_int_indices(indices)):
+            # respect subclasses that override __getitem__, e.g. to sample
+            # pairs of windows
+            return [self[i] for i in indices]
+        items = self._get_items(indices)
+        if self.target_transform is not None:
+            items = [
+                item[:1] + (self.target_transform(item[1]),) + item[2:]
+                for item in items]
+        return items
+
     def split(self, by=None, property=None, split_ids=None):
         """Split the dataset based on information listed in its description
         DataFrame or based on indices.
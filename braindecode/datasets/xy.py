@@ -53,9 +53,10 @@ def create_from_X_y(
         ch_names = [str(i) for i in range(X.shape[1])]
         log.info(f"No channel names given, set to 0-{X.shape[1]}).")
 
+    # RawArray copies the info, so it can be shared by all trials
+    info = mne.create_info(ch_names=ch_names, sfreq=sfreq)
     for x, target in zip(X, y):
         n_samples_per_x.append(x.shape[1])
-        info = mne.create_info(ch_names=ch_names, sfreq=sfreq)
         raw = mne.io.RawArray(x, info)
         base_dataset = BaseDataset(raw, pd.Series({"target": target}),
                                    target_name="target")
@@ -149,6 +149,11 @@ class CroppedTrialEpochScoring(EpochScoring):
 
     def on_batch_end(
              self, net, batch, y_pred, training, **kwargs):
+        # Predictions on the training set are recomputed in eval mode at the
+        # end of the epoch, so there is no need to collect the ones of the
+        # training batches (and to copy them from GPU) in the first place
+        if self.on_train:
+            return
         # Skorch saves the predictions without moving them from GPU
         # https://github.com/skorch-dev/skorch/blob/fe71e3d55a4ae5f5f94ef7bdfc00fca3b3fd267f/skorch/callbacks/scoring.py#L385
         # This can cause memory issues in case of a large number of predictions
@@ -0,0 +1,118 @@
+# Authors: Maciej Sliwowski
+#          Robin Tibor Schirrmeister
+#
+# License: BSD-3
+
+import os
+
+import mne
+import numpy as np
+import pytest
+import torch
+from joblib import Parallel, delayed
+from mne.io import concatenate_raws
+
+# bump whenever _epoch_physionet changes what it returns, so that stale
+# cached trials are not reused
+_PHYSIONET_CACHE_VERSION = 1
+
+
+def _load_physionet_xy(cache_dir, subject_id, event_codes, tmin, tmax):
+    """Load hands/feet trials of the PhysioNet motor imagery dataset.
+
+    Loading, concatenating and epoching the raw files dominates the runtime
+    of the acceptance tests, so the resulting arrays are cached on disk and
+    reused by subsequent test runs. The cache lives in ``cache_dir``,
+    pytest's cache directory unless the cacheprovider plugin is disabled, so
+    ``pytest --cache-clear`` removes it, and is keyed on
+    ``_PHYSIONET_CACHE_VERSION`` and the MNE version. The trials are returned
+    memory-mapped, which only makes loading the cache faster: the tests copy
+    them into mne Raw objects through ``create_from_X_y`` anyway.
+    """
+    cache_stem = os.path.join(
+        cache_dir,
+        f"v{_PHYSIONET_CACHE_VERSION}_mne{mne.__version__}"
+        f"_s{subject_id}_{'-'.join(map(str, event_codes))}_{tmin}_{tmax}")
+    X_path, y_path = cache_stem + "_X.npy", cache_stem + "_y.npy"
+    if not (os.path.exists(X_path) and os.path.exists(y_path)):
+        X, y = _epoch_physionet(subject_id, event_codes, tmin, tmax)
+        # write to temporary files first so that concurrent test runs never
+        # read a partially written cache
+        for path, arr in ((X_path, X), (y_path, y)):
+            tmp_path = path[:-len(".npy")] + f"_{os.getpid()}.npy"
+            np.save(tmp_path, arr)
+            os.replace(tmp_path, path)
+    return np.load(X_path, mmap_mode="r"), np.load(y_path)
+
+
+def _epoch_physionet(subject_id, event_codes, tmin, tmax):
+    # This will download the files if you don't have them yet,
+    # and then return the paths to the files.
+    physionet_paths = mne.datasets.eegbci.load_data(
+        subject_id, list(event_codes), update_path=False
+    )
+
+    # Load each of the files, in parallel threads as reading is mostly I/O
+    parts = Parallel(n_jobs=len(physionet_paths), prefer="threads")(
+        delayed(mne.io.read_raw_edf)(
+            path, preload=True, stim_channel="auto", verbose="WARNING"
+        )
+        for path in physionet_paths
+    )
+
+    # Concatenate them
+    raw = concatenate_raws(parts)
+
+    # Find the events in this dataset
+    events, _ = mne.events_from_annotations(raw)
+
+    # Use only EEG channels
+    eeg_channel_inds = mne.pick_types(
+        raw.info, meg=False, eeg=True, stim=False, eog=False, exclude="bads"
+    )
+
+    # Extract trials, only using EEG channels
+    epoched = mne.Epochs(
+        raw,
+        events,
+        dict(hands=2, feet=3),
+        tmin=tmin,
+        tmax=tmax,
+        proj=False,
+        picks=eeg_channel_inds,
+        baseline=None,
+        preload=True,
+    )
+
+    # Convert data from volt to microvolt while extracting it from the
+    # epochs, avoiding a separate scaling pass over a float64 copy.
+    # Pytorch expects float32 for input and int64 for labels.
+    X = epoched.get_data(units="uV").astype(np.float32)
+    y = (epoched.events[:, 2] - 2).astype(np.int64)  # 2,3 -> 0,1
+
+    return X, y
+
+
+@pytest.fixture(autouse=True)
+def limit_torch_threads():
+    # The models trained here are tiny, on many-core machines the overhead
+    # of spawning many threads outweighs the actual convolution work
+    n_threads = torch.get_num_threads()
+    torch.set_num_threads(min(4, n_threads))
+    yield
+    torch.set_num_threads(n_threads)
+
+
+@pytest.fixture(scope="session")
+def physionet_xy(request, tmp_path_factory):
+    cache = getattr(request.config, "cache", None)
+    if cache is not None:
+        cache_dir = cache.mkdir("braindecode_eegbci")
+    else:
+        # the cacheprovider plugin is disabled, only cache for this session
+        cache_dir = tmp_path_factory.mktemp("braindecode_eegbci")
+    cache_dir = str(cache_dir)
+    # 5,6,9,10,13,14 are codes for executed and imagined hands/feet
+    return _load_physionet_xy(
+        cache_dir, subject_id=1, event_codes=(5, 6, 9, 10, 13, 14),
+        tmin=1, tmax=4.1)
@@ -3,10 +3,8 @@
 #
 # License: BSD-3
 
-import mne
 import numpy as np
 import torch
-from mne.io import concatenate_raws
 from skorch.helper import predefined_split
 from torch import optim
 
@@ -18,51 +16,8 @@ from braindecode.models.util import to_dense_prediction_model, get_output_shape
 from braindecode.util import set_random_seeds
 
 
-def test_cropped_decoding():
-    # 5,6,7,10,13,14 are codes for executed and imagined hands/feet
-    subject_id = 1
-    event_codes = [5, 6, 9, 10, 13, 14]
-
-    # This will download the files if you don't have them yet,
-    # and then return the paths to the files.
-    physionet_paths = mne.datasets.eegbci.load_data(
-        subject_id, event_codes, update_path=False
-    )
-
-    # Load each of the files
-    parts = [
-        mne.io.read_raw_edf(
-            path, preload=True, stim_channel="auto", verbose="WARNING"
-        )
-        for path in physionet_paths
-    ]
-
-    # Concatenate them
-    raw = concatenate_raws(parts)
-
-    # Find the events in this dataset
-    events, _ = mne.events_from_annotations(raw)
-    # Use only EEG channels
-    eeg_channel_inds = mne.pick_types(
-        raw.info, meg=False, eeg=True, stim=False, eog=False, exclude="bads"
-    )
-
-    # Extract trials, only using EEG channels
-    epoched = mne.Epochs(
-        raw,
-        events,
-        dict(hands=2, feet=3),
-        tmin=1,
-        tmax=4.1,
-        proj=False,
-        picks=eeg_channel_inds,
-        baseline=None,
-        preload=True,
-    )
-    # Convert data from volt to millivolt
-    # Pytorch expects float32 for input and int64 for labels.
-    X = (epoched.get_data() * 1e6).astype(np.float32)
-    y = (epoched.events[:, 2] - 2).astype(np.int64)  # 2,3 -> 0,1
+def test_cropped_decoding(physionet_xy):
+    X, y = physionet_xy
 
     # Set if you want to use GPU
     # You can also use torch.cuda.is_available() to determine if cuda is available on your machine.
@@ -4,9 +4,8 @@
 #
 # License: BSD-3
 
-import mne
 import numpy as np
-from mne.io import concatenate_raws
+import torch
 from skorch.helper import predefined_split
 from torch import optim
 from torch.nn.functional import nll_loss
@@ -20,103 +19,128 @@ from braindecode.training.scoring import CroppedTrialEpochScoring
 from braindecode.util import set_random_seeds, np_to_th
 
 
-def assert_deep_allclose(expected, actual, *args, **kwargs):
-    """
-    Assert that two complex structures have almost equal contents.
+def _flatten(obj, path="ROOT"):
+    """Yield (path, value) pairs for all leaves of nested lists, tuples,
+    arrays and dicts."""
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        for index, value in enumerate(obj):
+            yield from _flatten(value, "%s -> %r" % (path, index))
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _flatten(value, "%s -> %r" % (path, key))
+    else:
+        yield path, obj
+
 
-    Compares lists, dicts and tuples recursively. Checks numeric values
-    using test_case's :py:meth:`unittest.TestCase.assertAlmostEqual` and
-    checks all other values with :py:meth:`unittest.TestCase.assertEqual`.
-    Accepts additional positional and keyword arguments and pass those
-    intact to assertAlmostEqual() (that's how you specify comparison
-    precision).
+def _assert_flat_allclose(expected, actual, *args, **kwargs):
     """
-    is_root = "__trace" not in kwargs
-    trace = kwargs.pop("__trace", "ROOT")
-    try:
-        if isinstance(expected, (int, float, complex)):
-            np.testing.assert_allclose(expected, actual, *args, **kwargs)
-        elif isinstance(expected, (list, tuple, np.ndarray)):
-            assert len(expected) == len(actual)
-            for index in range(len(expected)):
-                v1, v2 = expected[index], actual[index]
-                assert_deep_allclose(
-                    v1, v2, __trace=repr(index), *args, **kwargs
-                )
-        elif isinstance(expected, dict):
-            assert set(expected) == set(actual)
-            for key in expected:
-                assert_deep_allclose(
-                    expected[key],
-                    actual[key],
-                    __trace=repr(key),
-                    *args,
-                    **kwargs
-                )
+    Assert that two {path: value} mappings produced by _flatten have almost
+    equal contents.
+
+    Checks that both mappings have the same paths. All numeric values are
+    compared at once using :py:func:`numpy.testing.assert_allclose`, all
+    other values are checked for equality. Accepts additional positional and
+    keyword arguments and passes those intact to assert_allclose() (that's
+    how you specify comparison precision).
+    """
+    assert expected.keys() == actual.keys(), (
+        "Structures differ\nonly expected: %s\nonly actual: %s" % (
+            sorted(expected.keys() - actual.keys()),
+            sorted(actual.keys() - expected.keys())))
+
+    numeric_paths = []
+    for path, value in expected.items():
+        if isinstance(value, (int, float, complex)):
+            numeric_paths.append(path)
         else:
-            assert expected == actual
-    except AssertionError as exc:
-        exc.__dict__.setdefault("traces", []).append(trace)
-        msg = (
-            exc.message
-            if hasattr(exc, "message")
-            else exc.args[0]
-            if exc.args
-            else ""
-        )
-        if is_root:
-            trace = " -> ".join(reversed(exc.traces))
-            exc = AssertionError("%s\nTRACE: %s" % (msg, trace))
-        raise exc
-
-
-def test_eeg_classifier():
-    # 5,6,7,10,13,14 are codes for executed and imagined hands/feet
-    subject_id = 1
-    event_codes = [5, 6, 9, 10, 13, 14]
-
-    # This will download the files if you don't have them yet,
-    # and then return the paths to the files.
-    physionet_paths = mne.datasets.eegbci.load_data(
-        subject_id, event_codes, update_path=False
-    )
-
-    # Load each of the files
-    parts = [
-        mne.io.read_raw_edf(
-            path, preload=True, stim_channel="auto", verbose="WARNING"
-        )
-        for path in physionet_paths
-    ]
-
-    # Concatenate them
-    raw = concatenate_raws(parts)
-
-    # Find the events in this dataset
-    events, _ = mne.events_from_annotations(raw)
-
-    # Use only EEG channels
-    eeg_channel_inds = mne.pick_types(
-        raw.info, meg=False, eeg=True, stim=False, eog=False, exclude="bads"
-    )
-
-    # Extract trials, only using EEG channels
-    epoched = mne.Epochs(
-        raw,
-        events,
-        dict(hands=2, feet=3),
-        tmin=1,
-        tmax=4.1,
-        proj=False,
-        picks=eeg_channel_inds,
-        baseline=None,
-        preload=True,
-    )
-
-    # Convert data from volt to millivolt
-    # Pytorch expects float32 for input and int64 for labels.
-    X = (epoched.get_data() * 1e6).astype(np.float32)
-    y = (epoched.events[:, 2] - 2).astype(np.int64)  # 2,3 -> 0,1
+            assert value == actual[path], (
+                "%r != %r\nTRACE: %s" % (value, actual[path], path))
+    try:
+        np.testing.assert_allclose(
+            [expected[path] for path in numeric_paths],
+            [actual[path] for path in numeric_paths],
+            *args, **kwargs)
+    except AssertionError:
+        # compare values one by one to report where they differ
+        for path in numeric_paths:
+            try:
+                np.testing.assert_allclose(
+                    expected[path], actual[path], *args, **kwargs)
+            except AssertionError as exc:
+                raise AssertionError(
+                    "%s\nTRACE: %s" % (exc.args[0], path)) from None
+        raise
+
+
+# Reproduce this exact output by using pprint(history_without_dur) and adjusting
+# indentation of all lines after first
+EXPECTED_HISTORY = [{'batches': [{'train_batch_size': 32, 'train_loss': 1.4175944328308105},
+                                 {'train_batch_size': 32, 'train_loss': 2.4414331912994385},
+                                 {'train_batch_size': 32, 'train_loss': 1.476792812347412},
+                                 {'valid_batch_size': 24, 'valid_loss': 1.2322615385055542}],
+                     'epoch': 1,
+                     'train_batch_count': 3,
+                     'train_loss': 1.7786068121592205,
+                     'train_loss_best': True,
+                     'train_trial_accuracy': 0.5,
+                     'train_trial_accuracy_best': True,
+                     'valid_batch_count': 1,
+                     'valid_loss': 1.2322615385055542,
+                     'valid_loss_best': True,
+                     'valid_trial_accuracy': 0.5,
+                     'valid_trial_accuracy_best': True},
+                    {'batches': [{'train_batch_size': 32, 'train_loss': 0.9673743844032288},
+                                 {'train_batch_size': 32, 'train_loss': 1.218681812286377},
+                                 {'train_batch_size': 32, 'train_loss': 1.5651403665542603},
+                                 {'valid_batch_size': 24, 'valid_loss': 1.123423457145691}],
+                     'epoch': 2,
+                     'train_batch_count': 3,
+                     'train_loss': 1.250398854414622,
+                     'train_loss_best': True,
+                     'train_trial_accuracy': 0.5,
+                     'train_trial_accuracy_best': False,
+                     'valid_batch_count': 1,
+                     'valid_loss': 1.123423457145691,
+                     'valid_loss_best': True,
+                     'valid_trial_accuracy': 0.5,
+                     'valid_trial_accuracy_best': False},
+                    {'batches': [{'train_batch_size': 32, 'train_loss': 1.1562678813934326},
+                                 {'train_batch_size': 32, 'train_loss': 1.5787755250930786},
+                                 {'train_batch_size': 32, 'train_loss': 1.306514859199524},
+                                 {'valid_batch_size': 24, 'valid_loss': 1.037418007850647}],
+                     'epoch': 3,
+                     'train_batch_count': 3,
+                     'train_loss': 1.3471860885620117,
+                     'train_loss_best': False,
+                     'train_trial_accuracy': 0.5208333333333334,
+                     'train_trial_accuracy_best': True,
+                     'valid_batch_count': 1,
+                     'valid_loss': 1.037418007850647,
+                     'valid_loss_best': True,
+                     'valid_trial_accuracy': 0.5,
+                     'valid_trial_accuracy_best': False},
+                    {'batches': [{'train_batch_size': 32, 'train_loss': 1.8480840921401978},
+                                 {'train_batch_size': 32, 'train_loss': 1.0466501712799072},
+                                 {'train_batch_size': 32, 'train_loss': 0.9813234210014343},
+                                 {'valid_batch_size': 24, 'valid_loss': 0.9420649409294128}],
+                     'epoch': 4,
+                     'train_batch_count': 3,
+                     'train_loss': 1.2920192281405132,
+                     'train_loss_best': False,
+                     'train_trial_accuracy': 0.75,
+                     'train_trial_accuracy_best': True,
+                     'valid_batch_count': 1,
+                     'valid_loss': 0.9420649409294128,
+                     'valid_loss_best': True,
+                     'valid_trial_accuracy': 0.4166666666666667,
+                     'valid_trial_accuracy_best': False}]
+
+# flattened once at import, see _assert_flat_allclose
+_EXPECTED_HISTORY_FLAT = dict(_flatten(EXPECTED_HISTORY))
+
+
+def test_eeg_classifier(physionet_xy):
+    X, y = physionet_xy
 
     # Set if you want to use GPU
     # You can also use torch.cuda.is_available() to determine if cuda is available on your machine.
@@ -141,12 +165,12 @@ def test_eeg_classifier():
 
     # determine output size
     test_input = np_to_th(
-        np.ones((2, in_chans, input_window_samples, 1), dtype=np.float32)
+        np.ones((2, in_chans, input_window_samples), dtype=np.float32)
     )
     if cuda:
         test_input = test_input.cuda()
-    out = model(test_input)
-    n_preds_per_input = out.cpu().data.numpy().shape[2]
+    with torch.inference_mode():
+        n_preds_per_input = model(test_input).shape[2]
 
     train_set = create_from_X_y(X[:48], y[:48],
                                 drop_last_window=False,
@@ -180,6 +204,8 @@ def test_eeg_classifier():
         criterion=CroppedLoss,
         criterion__loss_function=nll_loss,
         optimizer=optim.Adam,
+        # update all parameter tensors with grouped foreach kernels
+        optimizer__foreach=True,
         train_split=predefined_split(valid_set),
         batch_size=32,
         callbacks=[
@@ -190,71 +216,10 @@ def test_eeg_classifier():
 
     clf.fit(train_set, y=None, epochs=4)
 
-    # Reproduce this exact output by using pprint(history_without_dur) and adjusting
-    # indentation of all lines after first
-    expectedh = [{'batches': [{'train_batch_size': 32, 'train_loss': 1.4175944328308105},
-                              {'train_batch_size': 32, 'train_loss': 2.4414331912994385},
-                              {'train_batch_size': 32, 'train_loss': 1.476792812347412},
-                              {'valid_batch_size': 24, 'valid_loss': 1.2322615385055542}],
-                  'epoch': 1,
-                  'train_batch_count': 3,
-                  'train_loss': 1.7786068121592205,
-                  'train_loss_best': True,
-                  'train_trial_accuracy': 0.5,
-                  'train_trial_accuracy_best': True,
-                  'valid_batch_count': 1,
-                  'valid_loss': 1.2322615385055542,
-                  'valid_loss_best': True,
-                  'valid_trial_accuracy': 0.5,
-                  'valid_trial_accuracy_best': True},
-                 {'batches': [{'train_batch_size': 32, 'train_loss': 0.9673743844032288},
-                              {'train_batch_size': 32, 'train_loss': 1.218681812286377},
-                              {'train_batch_size': 32, 'train_loss': 1.5651403665542603},
-                              {'valid_batch_size': 24, 'valid_loss': 1.123423457145691}],
-                  'epoch': 2,
-                  'train_batch_count': 3,
-                  'train_loss': 1.250398854414622,
-                  'train_loss_best': True,
-                  'train_trial_accuracy': 0.5,
-                  'train_trial_accuracy_best': False,
-                  'valid_batch_count': 1,
-                  'valid_loss': 1.123423457145691,
-                  'valid_loss_best': True,
-                  'valid_trial_accuracy': 0.5,
-                  'valid_trial_accuracy_best': False},
-                 {'batches': [{'train_batch_size': 32, 'train_loss': 1.1562678813934326},
-                              {'train_batch_size': 32, 'train_loss': 1.5787755250930786},
-                              {'train_batch_size': 32, 'train_loss': 1.306514859199524},
-                              {'valid_batch_size': 24, 'valid_loss': 1.037418007850647}],
-                  'epoch': 3,
-                  'train_batch_count': 3,
-                  'train_loss': 1.3471860885620117,
-                  'train_loss_best': False,
-                  'train_trial_accuracy': 0.5208333333333334,
-                  'train_trial_accuracy_best': True,
-                  'valid_batch_count': 1,
-                  'valid_loss': 1.037418007850647,
-                  'valid_loss_best': True,
-                  'valid_trial_accuracy': 0.5,
-                  'valid_trial_accuracy_best': False},
-                 {'batches': [{'train_batch_size': 32, 'train_loss': 1.8480840921401978},
-                              {'train_batch_size': 32, 'train_loss': 1.0466501712799072},
-                              {'train_batch_size': 32, 'train_loss': 0.9813234210014343},
-                              {'valid_batch_size': 24, 'valid_loss': 0.9420649409294128}],
-                  'epoch': 4,
-                  'train_batch_count': 3,
-                  'train_loss': 1.2920192281405132,
-                  'train_loss_best': False,
-                  'train_trial_accuracy': 0.75,
-                  'train_trial_accuracy_best': True,
-                  'valid_batch_count': 1,
-                  'valid_loss': 0.9420649409294128,
-                  'valid_loss_best': True,
-                  'valid_trial_accuracy': 0.4166666666666667,
-                  'valid_trial_accuracy_best': False}]
-
     history_without_dur = [
         {k: v for k, v in h.items() if k != "dur"} for h in clf.history
     ]
-    assert_deep_allclose(expectedh, history_without_dur, atol=1e-3, rtol=1e-3)
+    _assert_flat_allclose(
+        _EXPECTED_HISTORY_FLAT, dict(_flatten(history_without_dur)),
+        atol=1e-3, rtol=1e-3)
     return clf
@@ -7,9 +7,11 @@ import mne
 import numpy as np
 import pandas as pd
 import pytest
+from torch.utils.data import DataLoader
 
 from braindecode.datasets import WindowsDataset, BaseDataset, BaseConcatDataset
 from braindecode.datasets.moabb import fetch_data_with_moabb
+from braindecode.datasets.xy import create_from_X_y
 from braindecode.preprocessing.windowers import (
     create_windows_from_events, create_fixed_length_windows)
 
@@ -82,6 +84,122 @@ def test_get_item(set_up):
                                       f'window inds not equal for epoch {i}')
 
 
+def test_get_item_preloaded(set_up):
+    _, _, mne_epochs, windows_dataset, _, _ = set_up
+    preloaded_ds = WindowsDataset(mne_epochs.copy().load_data())
+    for i in range(len(windows_dataset)):
+        x, y, inds = preloaded_ds[i]
+        x_lazy, y_lazy, inds_lazy = windows_dataset[i]
+        assert x.dtype == np.float32
+        np.testing.assert_array_equal(x_lazy, x)
+        assert y_lazy == y
+        assert inds_lazy == inds
+
+
+def test_get_items(set_up):
+    _, _, _, windows_dataset, _, _ = set_up
+    indices = [3, 0, 4, 0]
+    items = windows_dataset.__getitems__(indices)
+    assert len(items) == len(indices)
+    for i, (x, y, inds) in zip(indices, items):
+        x_i, y_i, inds_i = windows_dataset[i]
+        np.testing.assert_array_equal(x_i, x)
+        assert y_i == y
+        assert inds_i == inds
+
+
+def test_get_items_rejected_windows(set_up, monkeypatch):
+    _, _, mne_epochs, _, _, _ = set_up
+    windows_dataset = WindowsDataset(mne_epochs.copy().load_data())
+    get_data = windows_dataset.windows.get_data
+
+    def get_data_rejecting_first(item=None):
+        # mimic a window rejected while reading a batch
+        X = get_data(item=item)
+        return X[1:] if isinstance(item, list) else X
+
+    monkeypatch.setattr(
+        windows_dataset.windows, 'get_data', get_data_rejecting_first)
+    indices = [3, 0, 2]
+    items = windows_dataset.__getitems__(indices)
+    assert len(items) == len(indices)
+    for i, (x, y, inds) in zip(indices, items):
+        x_i, y_i, inds_i = windows_dataset[i]
+        np.testing.assert_array_equal(x_i, x)
+        assert y_i == y
+        assert inds_i == inds
+
+
+def test_get_items_concat_dataset(set_up):
+    _, _, _, windows_dataset, _, _ = set_up
+    concat_ds = BaseConcatDataset([windows_dataset, windows_dataset])
+    concat_ds.target_transform = lambda y: y + 1
+    indices = [7, 1, -1, 5, 0]
+    items = concat_ds.__getitems__(indices)
+    assert len(items) == len(indices)
+    for i, (x, y, inds) in zip(indices, items):
+        x_i, y_i, inds_i = concat_ds[i]
+        np.testing.assert_array_equal(x_i, x)
+        assert y_i == y
+        assert inds_i == inds
+
+
+def test_get_items_concat_dataset_subclass(set_up):
+    _, _, _, windows_dataset, _, _ = set_up
+
+    class PairsDataset(BaseConcatDataset):
+        def __getitem__(self, index):
+            ind1, ind2, y = index
+            return (super().__getitem__(ind1)[0],
+                    super().__getitem__(ind2)[0], y)
+
+    pairs_ds = PairsDataset([windows_dataset, windows_dataset])
+    indices = [(7, 1, 0), (2, 5, 1)]
+    items = pairs_ds.__getitems__(indices)
+    assert len(items) == len(indices)
+    for (ind1, ind2, y), (x1, x2, y_item) in zip(indices, items):
+        np.testing.assert_array_equal(
+            x1, BaseConcatDataset.__getitem__(pairs_ds, ind1)[0])
+        np.testing.assert_array_equal(
+            x2, BaseConcatDataset.__getitem__(pairs_ds, ind2)[0])
+        assert y_item == y
+
+
+def test_data_loader_sequence_sampler():
+    rng = np.random.RandomState(42)
+    concat_ds = create_from_X_y(
+        rng.randn(4, 2, 400), rng.randint(2, size=4), drop_last_window=False,
+        sfreq=100, window_size_samples=100, window_stride_samples=100)
+    sampler = [tuple(range(start, start + 3)) for start in (0, 5, 10, 2)]
+    loader = DataLoader(concat_ds, batch_size=2, sampler=sampler)
+    batches = list(loader)
+    assert len(batches) == 2
+    for (X, y), seqs in zip(batches, (sampler[:2], sampler[2:])):
+        X_expected, y_expected = zip(*[concat_ds[list(seq)] for seq in seqs])
+        np.testing.assert_array_equal(X, np.stack(X_expected))
+        np.testing.assert_array_equal(y, np.stack(y_expected))
+
+
+def test_get_sequence_concat_dataset(set_up):
+    _, _, _, windows_dataset, _, _ = set_up
+    concat_ds = BaseConcatDataset([windows_dataset, windows_dataset])
+    indices = [7, 1, -1, 5, 0]
+    X, y = concat_ds[indices]
+    np.testing.assert_array_equal(
+        X, np.stack([concat_ds[i][0] for i in indices]))
+    np.testing.assert_array_equal(y, [concat_ds[i][1] for i in indices])
+
+    concat_ds.target_transform = sum
+    assert concat_ds[indices][1] == sum(y)
+
+
+def test_get_sequence_concat_dataset_non_integer_indices(set_up):
+    _, _, _, windows_dataset, _, _ = set_up
+    concat_ds = BaseConcatDataset([windows_dataset, windows_dataset])
+    with pytest.raises(IndexError, match='only integers'):
+        concat_ds[[0, 1.5]]
+
+
 def test_len_windows_dataset(set_up):
     _, _, mne_epochs, windows_dataset, _, _ = set_up
     assert len(mne_epochs.events) == len(windows_dataset)
@@ -7,7 +7,8 @@ import pytest
 import numpy as np
 import torch
 
-from braindecode.training.losses import mixup_criterion, TimeSeriesLoss
+from braindecode.training.losses import (
+    CroppedLoss, mixup_criterion, TimeSeriesLoss)
 
 
 def test_mixup_criterion():
@@ -32,6 +33,18 @@ def test_mixup_criterion():
     assert loss == pytest.approx(expected)
 
 
+def test_cropped_loss():
+    n_samples, n_classes, n_preds = 4, 3, 5
+    rng = np.random.RandomState(42)
+    preds = torch.log_softmax(
+        torch.Tensor(rng.randn(n_samples, n_classes, n_preds)), dim=1)
+    targets = torch.LongTensor(rng.randint(0, n_classes, n_samples))
+
+    loss = CroppedLoss(torch.nn.functional.nll_loss)(preds, targets)
+    expected = torch.nn.functional.nll_loss(preds.mean(dim=2), targets)
+    assert loss == pytest.approx(expected)
+
+
 def test_time_series_loss():
     targets = torch.Tensor(
         np.array(
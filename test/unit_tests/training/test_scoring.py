@@ -157,6 +157,17 @@ def test_cropped_trial_epoch_scoring_none_x_test():
     assert output is None
 
 
+def test_cropped_trial_epoch_scoring_on_train_no_batch_caching():
+    cropped_trial_epoch_scoring = CroppedTrialEpochScoring(
+        "accuracy", on_train=True)
+    cropped_trial_epoch_scoring.initialize()
+    batch = (torch.zeros(2, 1, 10), torch.tensor([0, 1]))
+    cropped_trial_epoch_scoring.on_batch_end(
+        MockSkorchNet(), batch, torch.zeros(2, 2, 4), training=True)
+    assert cropped_trial_epoch_scoring.y_preds_ == []
+    assert cropped_trial_epoch_scoring.y_trues_ == []
+
+
 def test_cropped_time_series_trial_epoch_scoring():
 
     dataset_train = None